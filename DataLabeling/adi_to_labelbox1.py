@@ -1,7 +1,53 @@
 import json
+import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
+import numpy as np
+
+# ijson is optional: it streams pages out of large ADI files; without it the file is loaded whole.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# orjson is optional: it serializes straight to UTF-8 bytes (and handles NumPy and slotted
+# dataclasses natively); without it NDJSON is written through the stdlib json encoder.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+NDJSON_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else None
+
+# Namespace for deterministic (UUIDv5) ids: reruns on the same data row give identical NDJSON
+READ_LAYER_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "azure_ai_document_intelligence/read")
+
+# Fixed NDJSON envelope (same key order as build_read_layer); only the variable parts are serialized.
+# Slots: uuid, dataRow id (JSON), prediction_id, feature name (JSON), tokens (JSON), lines (JSON)
+NDJSON_TEMPLATE = (
+    b'{"uuid":"%b","dataRow":{"id":%b},"predictions":[{"model":"azure_ai_document_intelligence",'
+    b'"prediction_id":"%b","result":[{"type":"read","name":%b,"value":{"tokens":%b,"lines":%b}}]}]}\n'
+)
+
+@dataclass(slots=True)
+class ReadToken:
+    """One Labelbox read-layer token (field order = NDJSON key order); orjson paths only."""
+    text: str
+    confidence: float
+    polygon: list
+    page: int
+
+@dataclass(slots=True)
+class ReadLine:
+    """One Labelbox read-layer line (field order = NDJSON key order); orjson paths only."""
+    text: str
+    polygon: list
+    page: int
+
 def azure_polygon_to_points(poly):
     """
     Converts Azure's flat list [x1, y1, x2, y2...] 
@@ -9,54 +55,151 @@ def azure_polygon_to_points(poly):
     """
     if not poly:
         return []
+    # Plain indexing beats both np.asarray and slice+zip for a single short polygon
     return [[poly[i], poly[i+1]] for i in range(0, len(poly), 2)]
 
-def build_read_layer(azure_analyze_result, data_row_id, feature_name="Document Read"):
+def iter_adi_pages(file_path):
+    """
+    Lazily yields page objects from an ADI JSON file without loading the whole document
+    (when ijson is installed). Handles both wrapped ({"analyzeResult": {...}}) and bare result files.
+    """
+    if ijson is None:
+        with open(file_path, "rb") as f:
+            result = json.load(f)
+        yield from result.get("analyzeResult", result).get("pages", [])
+        return
+
+    for prefix in ("analyzeResult.pages.item", "pages.item"):
+        found = False
+        with open(file_path, "rb") as f:
+            for page in ijson.items(f, prefix, use_float=True):
+                found = True
+                yield page
+        if found:
+            return
+
+def build_read_layer(azure_analyze_result, data_row_id, feature_name="Document Read", max_workers=1):
     """
     Converts Azure Read output to Labelbox Read-layer NDJSON.
     """
     # Extract the root result object
     ar = azure_analyze_result.get("analyzeResult", azure_analyze_result)
-    pages = ar.get("pages", [])
-
-    read_tokens = []
-    read_lines = []
-
-    for page in pages:
-        page_number = page.get("pageNumber")
-        
-        # Process Words/Tokens
-        for w in page.get("words", []):
-            poly = w.get("polygon")
-            text = w.get("content") or w.get("text")
-            if not poly or not text:
-                continue
-            
-            read_tokens.append({
+    return build_read_layer_from_pages(ar.get("pages", []), data_row_id, feature_name, max_workers)
+
+def build_read_layer_from_file(file_path, data_row_id, feature_name="Document Read", max_workers=1):
+    """
+    Streaming variant of build_read_layer: only one page's objects live at a time.
+    """
+    return build_read_layer_from_pages(iter_adi_pages(file_path), data_row_id, feature_name, max_workers)
+
+def _convert_page(page, as_records=False):
+    """
+    Converts one ADI page into (tokens, lines). Top-level so it can run in a worker process.
+    Tokens/lines are plain dicts, or slotted ReadToken/ReadLine records when as_records is set
+    (only for output that goes straight to orjson, which serializes them natively).
+    """
+    page_number = page.get("pageNumber")
+
+    # Process Words/Tokens
+    tokens = []
+    for w in page.get("words", []):
+        poly = w.get("polygon")
+        text = w.get("content") or w.get("text")
+        if not poly or not text:
+            continue
+
+        points = azure_polygon_to_points(poly)
+        confidence = w.get("confidence", 1.0)
+        if as_records:
+            tokens.append(ReadToken(text, confidence, points, page_number))
+        else:
+            tokens.append({
                 "text": text,
-                "confidence": w.get("confidence", 1.0),
-                "polygon": azure_polygon_to_points(poly),
+                "confidence": confidence,
+                "polygon": points,
                 "page": page_number
             })
 
-        # Process Lines
-        for line in page.get("lines", []):
-            poly = line.get("polygon")
-            text = line.get("content") or line.get("text")
-            if not poly or not text:
-                continue
+    # Process Lines
+    lines = []
+    for line in page.get("lines", []):
+        poly = line.get("polygon")
+        text = line.get("content") or line.get("text")
+        if not poly or not text:
+            continue
 
-            read_lines.append({
+        points = azure_polygon_to_points(poly)
+        if as_records:
+            lines.append(ReadLine(text, points, page_number))
+        else:
+            lines.append({
                 "text": text,
-                "polygon": azure_polygon_to_points(poly),
+                "polygon": points,
                 "page": page_number
             })
 
+    return tokens, lines
+
+def collect_read_layer(pages, max_workers=1, as_records=False):
+    """
+    Converts an iterable of ADI pages into flat (read_tokens, read_lines) lists.
+    Pages are independent, so max_workers > 1 (or None for all cores) converts them in a process pool.
+    """
+    convert = partial(_convert_page, as_records=as_records)
+    if max_workers == 1:
+        converted = list(map(convert, pages))
+    else:
+        pages = list(pages)
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(pages) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            converted = list(ex.map(convert, pages, chunksize=chunksize))
+
+    # Per-page sizes are known once pages are converted: allocate the output lists once
+    read_tokens = [None] * sum(len(tokens) for tokens, _ in converted)
+    read_lines = [None] * sum(len(lines) for _, lines in converted)
+    t_idx = l_idx = 0
+    for tokens, lines in converted:
+        read_tokens[t_idx:t_idx + len(tokens)] = tokens
+        t_idx += len(tokens)
+        read_lines[l_idx:l_idx + len(lines)] = lines
+        l_idx += len(lines)
+
+    return read_tokens, read_lines
+
+def _to_builtin(obj):
+    """json.dumps default: NumPy arrays/scalars to plain Python values."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(obj, newline=False):
+    """
+    Serializes obj to compact UTF-8 JSON bytes (optionally newline-terminated),
+    with orjson when installed and the stdlib encoder otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=NDJSON_OPTIONS if newline else orjson.OPT_SERIALIZE_NUMPY)
+    data = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_to_builtin).encode()
+    return data + b"\n" if newline else data
+
+def read_layer_ids(data_row_id, feature_name):
+    """Returns the deterministic (entry_uuid, prediction_id) pair for a data row."""
+    entry_uuid = str(uuid.uuid5(READ_LAYER_NAMESPACE, f"{data_row_id}|entry|{feature_name}"))
+    prediction_id = str(uuid.uuid5(READ_LAYER_NAMESPACE, f"{data_row_id}|pred|{feature_name}"))
+    return entry_uuid, prediction_id
+
+def build_read_layer_from_pages(pages, data_row_id, feature_name="Document Read", max_workers=1):
+    """
+    Builds the Labelbox Read-layer NDJSON entry from any iterable of ADI pages.
+    """
+    read_tokens, read_lines = collect_read_layer(pages, max_workers)
+
     # Construct the Labelbox NDJSON entry
-    prediction_id = str(uuid.uuid4())
+    entry_uuid, prediction_id = read_layer_ids(data_row_id, feature_name)
     
     ndjson_obj = {
-        "uuid": str(uuid.uuid4()),
+        "uuid": entry_uuid,
         "dataRow": {"id": data_row_id},
         "predictions": [
             {
@@ -77,3 +220,52 @@ def build_read_layer(azure_analyze_result, data_row_id, feature_name="Document R
     }
 
     return ndjson_obj
+
+def build_read_layer_batch(assets, feature_name="Document Read"):
+    """
+    Serializes many (azure_analyze_result, data_row_id) pairs into one NDJSON buffer.
+    """
+    name_json = dumps_json(feature_name)
+    # Slotted records only when orjson does the serializing; the stdlib encoder needs dicts
+    as_records = orjson is not None
+    buf = bytearray()
+    for azure_analyze_result, data_row_id in assets:
+        ar = azure_analyze_result.get("analyzeResult", azure_analyze_result)
+        read_tokens, read_lines = collect_read_layer(ar.get("pages", []), as_records=as_records)
+        entry_uuid, prediction_id = read_layer_ids(data_row_id, feature_name)
+        buf += NDJSON_TEMPLATE % (
+            entry_uuid.encode(),
+            dumps_json(data_row_id),
+            prediction_id.encode(),
+            name_json,
+            dumps_json(read_tokens),
+            dumps_json(read_lines),
+        )
+    return bytes(buf)
+
+def write_ndjson_bytes(data, output_path, append=False):
+    """
+    Writes a pre-serialized NDJSON buffer with one write call and a single fsync.
+    output_path is truncated unless append is set (same default as write_ndjson).
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC)
+    fd = os.open(output_path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def write_ndjson(entries, output_path, append=False):
+    """
+    Writes Labelbox NDJSON entries (one JSON object per line) to output_path.
+    Rows are serialized to UTF-8 bytes (see dumps_json) and coalesced into one
+    buffer before hitting the file.
+    """
+    buf = bytearray()
+    for entry in entries:
+        buf += dumps_json(entry, newline=True)
+    write_ndjson_bytes(buf, output_path, append=append)
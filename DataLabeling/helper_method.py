@@ -3,26 +3,28 @@ def get_block_details(self, block_dict):
     Extracts text, average font size, and bold status from a dictionary block.
     """
     text_content = []
-    sizes = []
+    max_size = 0.0  # running max, fused into the span loop
     is_bold = False
     
     # Iterate through lines and spans
     for line in block_dict.get("lines", []):
         for span in line.get("spans", []):
             text_content.append(span["text"])
-            sizes.append(span["size"])
+            size = span["size"]
+            if size > max_size:
+                max_size = size
             
-            # Check for bold:
+            # Check for bold (skipped once found, bold is a monotone OR):
             # 1. PyMuPDF 'flags': bit 4 (16) usually indicates bold
             # 2. Font name: sometimes contains 'Bold' or 'Medi'
-            if (span["flags"] & 16) or ("bold" in span["font"].lower()):
+            if not is_bold and ((span["flags"] & 16) or ("bold" in span["font"].lower())):
                 is_bold = True
 
     full_text = " ".join(text_content).strip()
     
     # Calculate representative size (Max or Average)
     # Using Max is usually safer for Headers as they might have mixed content
-    avg_size = round(max(sizes), 2) if sizes else 0.0
+    avg_size = round(max_size, 2)
 
     return full_text, avg_size, is_bold
 
@@ -37,16 +39,35 @@ def get_block_details(self, block_dict):
 doc = fitz.open(self.file_path)
 self.number_of_pages = len(doc)
 
+# Page count is known up front: size the per-slot signature lists once.
+# Pages without a block in a slot simply keep the '' default.
+candidates = {key: [''] * self.number_of_pages for key in ('top', 'top+1', 'bot', 'bot-1')}
+
+# Only text/size/font/flags are read from the spans: drop image blocks at the C layer
+# (no decoded image bytes in the dict) but keep the default dict flags otherwise.
+DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
 for page_idx in range(self.number_of_pages):
     page = doc[page_idx]
     
+    # Build the TextPage once; it backs both the cheap emptiness probe and the dict
+    textpage = page.get_textpage(flags=DICT_FLAGS)
+
+    # Scanned / image-only page: skip the (expensive) dict construction entirely
+    if not textpage.extractText().strip():
+        page_data[page_idx] = {}
+        continue
+
     # CHANGE 1: Use "dict" instead of "blocks"
     # This returns a dictionary containing a list of blocks
-    page_dict = page.get_text("dict")
+    page_dict = page.get_text("dict", textpage=textpage)
     raw_blocks = page_dict.get("blocks", [])
 
-    valid_blocks = []
-    
+    # --- 1. Identify Candidates (Top 2 and Bottom 2) ---
+    # Tracked while the blocks are parsed: one pass, no valid_blocks list and no
+    # sorts. Strict comparisons keep page order on ties, like a stable sort.
+    top_blk = top_plus_1_blk = bot_blk = bot_minus_1_blk = None
+
     for b in raw_blocks:
         # Filter for text blocks only (type 0 = text, 1 = image)
         if b.get("type") == 0:
@@ -57,36 +78,34 @@ for page_idx in range(self.number_of_pages):
                 # We extend the block dictionary with our parsed data
                 # Structure: [x0, y0, x1, y1, text, size, is_bold]
                 bbox = b["bbox"]
-                valid_blocks.append({
+                blk = {
                     "bbox": bbox,
                     "text": text,
                     "size": size,
                     "is_bold": is_bold,
-                    "y0": bbox[1], # for sorting
-                    "y1": bbox[3]  # for sorting
-                })
-
-    if not valid_blocks:
+                    "y0": bbox[1],
+                    "y1": bbox[3]
+                }
+                y0 = bbox[1]
+                y1 = bbox[3]
+                if top_blk is None or y0 < top_blk["y0"]:
+                    top_plus_1_blk = top_blk
+                    top_blk = blk
+                elif top_plus_1_blk is None or y0 < top_plus_1_blk["y0"]:
+                    top_plus_1_blk = blk
+                if bot_blk is None or y1 > bot_blk["y1"]:
+                    bot_minus_1_blk = bot_blk
+                    bot_blk = blk
+                elif bot_minus_1_blk is None or y1 > bot_minus_1_blk["y1"]:
+                    bot_minus_1_blk = blk
+
+    if top_blk is None:
         page_data[page_idx] = {}
-        self._fill_empty_candidates(candidates)
         continue
 
-    # --- 1. Identify Candidates (Top 2 and Bottom 2) ---
-
-    # Sort by y0 (Top)
-    by_top = sorted(valid_blocks, key=lambda x: x["y0"])
-
     # Check Table Overlap logic
     table_range = self.tables_y_coords.get(page_idx)
 
-    top_blk = by_top[0]
-    top_plus_1_blk = by_top[1] if len(by_top) > 1 else None
-
-    # Sort by y1 descending (Bottom)
-    by_bot = sorted(valid_blocks, key=lambda x: x["y1"], reverse=True)
-    bot_blk = by_bot[0]
-    bot_minus_1_blk = by_bot[1] if len(by_bot) > 1 else None
-
     # --- 2. Process Blocks & Generate Signatures ---
     
     def process_block(key, block_obj):
@@ -101,6 +120,6 @@ for page_idx in range(self.number_of_pages):
             # You can now use these variables to filter logic
             # Example: Only count as header if size > 10
             
-            candidates[key].append(sig)
+            candidates[key][page_idx] = sig
             # Store data...
             # ...
\ No newline at end of file
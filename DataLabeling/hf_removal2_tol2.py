@@ -1,29 +1,40 @@
 # --- 1. Identify Candidates (Top 2 and Bottom 2) ---
 
-                # Sort by y0 (Top)
-                by_top = sorted(valid_blocks, key=lambda b: b[1])
+                # One pass tracks the two smallest y0 and two largest y1 (as in
+                # select_page_blocks); strict comparisons keep page order on ties,
+                # exactly like the stable sorts they replace.
+                top_blk = top_plus_1_blk = bot_blk = bot_minus_1_blk = None
+                for b in valid_blocks:
+                    y0 = b[1]
+                    y1 = b[3]
+                    if top_blk is None or y0 < top_blk[1]:
+                        top_plus_1_blk = top_blk
+                        top_blk = b
+                    elif top_plus_1_blk is None or y0 < top_plus_1_blk[1]:
+                        top_plus_1_blk = b
+                    if bot_blk is None or y1 > bot_blk[3]:
+                        bot_minus_1_blk = bot_blk
+                        bot_blk = b
+                    elif bot_minus_1_blk is None or y1 > bot_minus_1_blk[3]:
+                        bot_minus_1_blk = b
 
                 # Check Table Overlap logic
                 table_range = self.tables_y_coords.get(page_idx)
 
-                top_blk = by_top[0]
-                top_plus_1_blk = by_top[1] if len(by_top) > 1 else None
-
                 if table_range:
                     table_start_y = table_range[0]
-                    
+
                     # LOGIC FIX 1: Check the FIRST block
                     # If the bottom of the text (b[3]) is below the table start, it's inside the table.
                     if top_blk and top_blk[3] > table_start_y:
                         top_blk = None
                         top_plus_1_blk = None
-                    
+
                     # LOGIC FIX 2: Check the SECOND block independently
-                    # This is the step missing in your previous attempts.
                     # Even if 'MEDICAL' (top) is valid, 'COMPARING COVERAGE' (top+1) might be in the table.
                     elif top_plus_1_blk and top_plus_1_blk[3] > table_start_y:
                         top_plus_1_blk = None
 
-                # Sort by y1 descending (Bottom)
-                by_bot = sorted(valid_blocks, key=lambda b: b[3], reverse=True)
-                # ... (rest of the code remains the same)
\ No newline at end of file
+                # Bottom 2 by y1 descending (same slots the old by_bot sort exposed)
+                by_bot = [b for b in (bot_blk, bot_minus_1_blk) if b is not None]
+                # ... (rest of the code remains the same)
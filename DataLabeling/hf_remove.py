@@ -1,3 +1,40 @@
+from itertools import chain
+
+import numpy as np
+
+
+def _polygon_y_bounds(polygons, with_max=True):
+    """
+    Returns (y_min, y_max) arrays for a batch of flat ADI polygons [x1, y1, x2, y2, ...].
+    Equal-length polygons are reduced in one vectorized pass, ragged ones with reduceat.
+    y_max is None when with_max is False (callers that only need the top edge).
+    """
+    lengths = {len(poly) for poly in polygons}
+    # Both vectorized paths need whole (x, y) pairs
+    pairs_only = all(n and n % 2 == 0 for n in lengths)
+    if pairs_only and len(lengths) == 1:
+        # Stream the JSON floats straight into one flat buffer (no nested-list conversion)
+        n_coords = lengths.pop()
+        flat = np.fromiter(chain.from_iterable(polygons), dtype=np.float64, count=n_coords * len(polygons))
+        ys = flat.reshape(len(polygons), -1, 2)[:, :, 1]
+        return ys.min(axis=1), (ys.max(axis=1) if with_max else None)
+    if pairs_only:
+        # Ragged (x, y)-pair polygons: concatenate, then reduce each region's
+        # y-run with reduceat at its offset into the flat y array
+        counts = np.fromiter(map(len, polygons), dtype=np.intp, count=len(polygons))
+        flat = np.fromiter(chain.from_iterable(polygons), dtype=np.float64, count=int(counts.sum()))
+        ys = flat[1::2]
+        starts = np.zeros(len(polygons), dtype=np.intp)
+        np.cumsum(counts[:-1] // 2, out=starts[1:])
+        return np.minimum.reduceat(ys, starts), (np.maximum.reduceat(ys, starts) if with_max else None)
+    # Malformed polygons: fall back to per-region reduction
+    y_min = np.array([min(poly[1::2]) for poly in polygons], dtype=np.float64)
+    if not with_max:
+        return y_min, None
+    y_max = np.array([max(poly[1::2]) for poly in polygons], dtype=np.float64)
+    return y_min, y_max
+
+
 def get_adi_results_optimized(file_path: str):
     d = get_form_recognizer_read_result(file_path, "prebuilt-layout")
     
@@ -5,57 +42,194 @@ def get_adi_results_optimized(file_path: str):
     tables_y_coords = {}
     INCH_TO_POINT = 72
 
-    # 1. Page Numbers (Same as above)
+    # 1. Page Numbers: collect regions, then reduce all polygons at once
+    pn_pages, pn_polygons = [], []
     for p in d.get('paragraphs', []):
         if p.get('role') == 'pageNumber':
             region = p['boundingRegions'][0]
-            # Use slicing [1::2] to get every 2nd element starting at index 1 (the Ys)
-            page_numbers_y_coords[region['pageNumber']] = min(region['polygon'][1::2]) * INCH_TO_POINT
+            pn_pages.append(region['pageNumber'])
+            pn_polygons.append(region['polygon'])
+
+    if pn_pages:
+        y_min, _ = _polygon_y_bounds(pn_polygons, with_max=False)
+        y_min *= INCH_TO_POINT
+        # Later regions on the same page win, as with sequential dict assignment
+        page_numbers_y_coords = dict(zip(pn_pages, y_min.tolist()))
 
     # 2. Tables (Direct Bounding Box Access)
+    t_pages, t_polygons = [], []
     for table in d.get('tables', []):
         # Most modern Azure results provide the bounding region for the whole table
         if 'boundingRegions' in table:
             for region in table['boundingRegions']:
-                page_num = region['pageNumber']
-                y_coords = region['polygon'][1::2]
-                
-                t_min = min(y_coords) * INCH_TO_POINT
-                t_max = max(y_coords) * INCH_TO_POINT
-                
-                if page_num in tables_y_coords:
-                    # Expand existing box to include this new table
-                    tables_y_coords[page_num][0] = min(tables_y_coords[page_num][0], t_min)
-                    tables_y_coords[page_num][1] = max(tables_y_coords[page_num][1], t_max)
-                else:
-                    tables_y_coords[page_num] = [t_min, t_max]
+                t_pages.append(region['pageNumber'])
+                t_polygons.append(region['polygon'])
         
         # Fallback: If 'boundingRegions' is missing on the table object, use the cell logic here
         else:
             # Insert the cell iteration logic from Approach A here
             pass
 
+    if t_pages:
+        y_min, y_max = _polygon_y_bounds(t_polygons)
+        y_min *= INCH_TO_POINT
+        y_max *= INCH_TO_POINT
+
+        # Expand each page's box to cover all its tables: page numbers index dense
+        # per-page arrays directly, and unbuffered scatter-reductions fold every
+        # region into its page slot in one C call (no sort needed to group pages)
+        pages = np.asarray(t_pages, dtype=np.intp)
+        page_min = np.full(pages.max() + 1, np.inf)
+        page_max = np.full(pages.max() + 1, -np.inf)
+        np.minimum.at(page_min, pages, y_min)
+        np.maximum.at(page_max, pages, y_max)
+
+        present = np.flatnonzero(np.bincount(pages))
+        tables_y_coords = {
+            page_num: [t_min, t_max]
+            for page_num, t_min, t_max in zip(present.tolist(), page_min[present].tolist(), page_max[present].tolist())
+        }
+
     return page_numbers_y_coords, tables_y_coords
 
 
 import fitz  # PyMuPDF
+import functools
+import os
 import re
-import heapq
-from collections import Counter
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple, Optional, Any
 
+# Optional linear-time (DFA) regex engine for long texts. Python's backtracking
+# engine goes quadratic on long whitespace runs, but has less per-call overhead
+# on short strings, so short headers/footers stay on the stdlib engine.
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Every cleaning pattern needs a digit; text without one can skip the cleaners entirely.
+# ASCII text is checked with a set test, other text with a single \d scan (Unicode Nd).
+_ASCII_DIGITS = frozenset('0123456789')
+_find_digit = re.compile(r'\d').search
+
+
+def _dfa_compile(pattern: str):
+    """RE2 twin of a stdlib pattern, valid for ASCII text (RE2's \\s lacks \\v and \\x1c-\\x1f)."""
+    if re2 is None:
+        return None
+    return re2.compile(pattern.replace(r'\s', r'[\t\n\v\f\r\x1c-\x1f ]'))
+
+_INF = float('inf')
+
+# Text-only block extraction: MuPDF drops image blocks ("<image: ...>") itself,
+# so they never reach the Python-side empty-block filter
+BLOCK_FLAGS = fitz.TEXTFLAGS_BLOCKS & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+def _top_bottom_2(blocks):
+    """
+    Single pass over get_text("blocks") tuples (x0, y0, x1, y1, "text", block_no, block_type),
+    skipping empty blocks, that returns (smallest y0, 2nd smallest y0, largest y1, 2nd largest y1).
+    Ties keep page order, as a stable sort would. Missing slots are None.
+    """
+    top1 = top2 = bot1 = bot2 = None
+    # Running extremes kept as plain floats so comparisons never re-index the picked tuples
+    top1_y0 = top2_y0 = _INF
+    bot1_y1 = bot2_y1 = -_INF
+    for b in blocks:
+        # Filter: remove empty blocks (non-text is already dropped by BLOCK_FLAGS), inline
+        # (no valid_blocks list, and isspace() tests without building a stripped copy)
+        text = b[4]
+        if not text or text.isspace():
+            continue
+        y0 = b[1]
+        y1 = b[3]
+        if y0 < top1_y0:
+            top2, top2_y0 = top1, top1_y0
+            top1, top1_y0 = b, y0
+        elif y0 < top2_y0 or top2 is None:
+            top2, top2_y0 = b, y0
+        if y1 > bot1_y1:
+            bot2, bot2_y1 = bot1, bot1_y1
+            bot1, bot1_y1 = b, y1
+        elif y1 > bot2_y1 or bot2 is None:
+            bot2, bot2_y1 = b, y1
+    return top1, top2, bot1, bot2
+
+
+def table_tops(tables_y_coords, n_pages):
+    """
+    Flattens {page_idx: [table_y_min, table_y_max]} into a per-page list of table_y_min,
+    +inf for pages without a table, so the per-page overlap check is one float compare.
+    """
+    tops = [_INF] * n_pages
+    for page_idx, table_range in tables_y_coords.items():
+        if table_range and 0 <= page_idx < n_pages:
+            tops[page_idx] = table_range[0]
+    return tops
+
+
+def select_page_candidates(blocks, table_top):
+    """
+    Picks the (top, top+1, bot, bot-1) blocks of one page from its get_text("blocks") output.
+    table_top is the page's first table y (+inf without tables).
+    Returns None when the page has no text blocks.
+    """
+    # --- 1. Identify Candidates ---
+    # We only need the top 2 and bottom 2, tracked in one linear pass instead of sorting.
+    top_blk, top_plus_1_blk, bot_blk, bot_minus_1_blk = _top_bottom_2(blocks)
+
+    if top_blk is None:
+        return None
+
+    # Table overlap check (Top)
+    # If the top block starts AFTER a table starts, it's likely body text, not header.
+    if top_blk[1] > table_top:
+        # The 'top' block is actually below the table start -> Invalid Header
+        top_blk = None
+        top_plus_1_blk = None
+
+    # Table overlap check (Bottom) - if bottom block ends BEFORE table ends? 
+    # (Logic usually checks if footer is inside table, but we'll stick to basic existence)
+
+    return top_blk, top_plus_1_blk, bot_blk, bot_minus_1_blk
+
+
+# --- Process-pool workers: each worker opens the PDF once and serves many pages ---
+_worker_doc = None
+_worker_table_tops: List[float] = []
+
+def _init_page_worker(file_path: str, table_tops: List[float]):
+    global _worker_doc, _worker_table_tops
+    _worker_doc = fitz.open(file_path)
+    _worker_table_tops = table_tops
+
+def _extract_page_candidates(page_idx: int):
+    blocks = _worker_doc[page_idx].get_text("blocks", flags=BLOCK_FLAGS)
+    return select_page_candidates(blocks, _worker_table_tops[page_idx])
+
+
 class PDFHeaderFooterExtractor:
     """
     Optimized class to extract headers, footers, and their positions from PDFs.
     """
 
+    # One extractor per PDF: fixed instance attributes, no per-instance __dict__
+    __slots__ = (
+        'file_path', 'doc', 'tables_y_coords', 'max_workers',
+        'headers', 'footers', 'cleaned_headers', 'cleaned_footers',
+        'number_of_pages', 'page_wise_coords', 'header_y1', 'footer_y0',
+    )
+
     # --- Constants & Regex (Compiled once for performance) ---
     INCH_TO_POINT = 72
     
     # Pattern to identify Page Numbers (Roman, standard, "Page X of Y")
+    # Digits, dashes and whitespace only: no IGNORECASE needed
     PAGE_NUM_PATTERN = re.compile(
-        r'(?:^\d+(?:/\d+)?\s*$)|(?:^\s*[\d+]\s*$)|(?:^\s*\d+\s*$)|(?:^\s*-\s*\d+\s*-\s*$)',
-        re.IGNORECASE
+        r'(?:^\d+(?:/\d+)?\s*$)|(?:^\s*\d+\s*$)|(?:^\s*-\s*\d+\s*-\s*$)'
     )
     
     # Cleaning patterns (removing numbers, dates, special chars to find common text)
@@ -70,10 +244,33 @@ class PDFHeaderFooterExtractor:
     # 5. Dash patterns: - 12 -
     PAT_DASH = re.compile(r'\s*-\s*\d+\s*-\s*$')
 
-    def __init__(self, file_path: str, tables_y_coords: Dict[int, List[float]] = None):
+    # Fused cleaners: one regex scan reproducing START -> BRACKET -> END -> DASH.
+    # The "dash then end" branch covers text like "Title - 5 - 7", where removing the
+    # trailing number (END) exposes a dash pattern for the following DASH pass.
+    PAT_TAIL = re.compile(
+        r'\s*-\s*\d+\s*-\s*\d+\s*$|' + PAT_END.pattern + '|' + PAT_DASH.pattern
+    )
+    PAT_CLEAN = re.compile(PAT_START.pattern + '|' + PAT_TAIL.pattern)
+    # Bracket removal can expose a new trailing number ("Foo 3 [2]"), so texts with
+    # brackets strip START/BRACKET first and run the tail patterns on the result.
+    PAT_HEAD = re.compile(PAT_START.pattern + '|' + PAT_BRACKET.pattern)
+
+    # RE2 versions of the fused cleaners (None without re2), used for ASCII text
+    # of at least DFA_MIN_LENGTH chars where RE2 overtakes the stdlib engine
+    DFA_MIN_LENGTH = 64
+    DFA_TAIL = _dfa_compile(PAT_TAIL.pattern)
+    DFA_CLEAN = _dfa_compile(PAT_CLEAN.pattern)
+    DFA_HEAD = _dfa_compile(PAT_HEAD.pattern)
+
+    def __init__(self, file_path: str, tables_y_coords: Dict[int, List[float]] = None, max_workers: Optional[int] = 1,
+                 doc: Optional[fitz.Document] = None):
         self.file_path = file_path
+        # Already-open document for file_path (owned by the caller), reused instead of a second fitz.open
+        self.doc = doc
         # Expecting tables_y_coords as {page_index: [min_y, max_y]}
         self.tables_y_coords = tables_y_coords if tables_y_coords else {}
+        # Page block extraction: 1 = in-process, None = all cores, N = N worker processes
+        self.max_workers = max_workers
         
         # Results
         self.headers: List[str] = []
@@ -84,25 +281,44 @@ class PDFHeaderFooterExtractor:
         
         # Final Coordinate Map: {page_index: [header_bbox, footer_bbox]}
         self.page_wise_coords: Dict[int, List[Any]] = {}
+        # Column views of page_wise_coords for margin statistics: header bottom (y1) and
+        # footer top (y0) per page, NaN where the page has no header/footer bbox
+        self.header_y1: np.ndarray = np.empty(0)
+        self.footer_y0: np.ndarray = np.empty(0)
 
     # --- Helper Methods ---
 
-    def clean_text(self, text: str) -> str:
-        """Removes page numbers and variable digits to normalize text for frequency analysis."""
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def clean_text(text: str) -> str:
+        """
+        Removes page numbers and variable digits to normalize text for frequency analysis.
+        Pure function of the text, so headers/footers repeated across pages and documents
+        hit the LRU cache.
+        """
         if not text: return ""
-        text = self.PAT_START.sub('', text)
-        text = self.PAT_BRACKET.sub('', text)
-        text = self.PAT_END.sub('', text)
-        text = self.PAT_DASH.sub('', text)
+        cls = PDFHeaderFooterExtractor
+        is_ascii = text.isascii()
+        if is_ascii:
+            has_digit = not _ASCII_DIGITS.isdisjoint(text)
+        else:
+            has_digit = _find_digit(text) is not None
+        if not has_digit:
+            return text.strip().replace('\n', ' ')
+        # Bare page numbers ("12"): unique per page so they always miss the cache, and
+        # the cleaners would strip them to nothing anyway (isdecimal() is exactly \d)
+        if text.strip().isdecimal():
+            return ""
+        if is_ascii and cls.DFA_CLEAN is not None and len(text) >= cls.DFA_MIN_LENGTH:
+            pat_head, pat_tail, pat_clean = cls.DFA_HEAD, cls.DFA_TAIL, cls.DFA_CLEAN
+        else:
+            pat_head, pat_tail, pat_clean = cls.PAT_HEAD, cls.PAT_TAIL, cls.PAT_CLEAN
+        if '[' in text:
+            text = pat_tail.sub('', pat_head.sub('', text))
+        else:
+            text = pat_clean.sub('', text)
         return text.strip().replace('\n', ' ')
 
-    @staticmethod
-    def get_most_common(data: List[str], n: int = 2) -> List[Tuple[str, int]]:
-        """Efficiently gets top N most common elements excluding empty strings."""
-        # Filter empty strings before counting to save processing
-        valid_items = [x for x in data if x]
-        return Counter(valid_items).most_common(n)
-
     # --- Main Extraction Logic ---
 
     def extract_headers_footers(self):
@@ -110,108 +326,75 @@ class PDFHeaderFooterExtractor:
         Main driver function. Opens PDF, extracts blocks, analyzes frequencies, 
         and maps final coordinates.
         """
-        # Temporary storage for analysis
-        # Structure: {page_index: {'top': block, 'top+1': block, 'bot': block, 'bot-1': block}}
-        page_data = {} 
-        
-        # Lists for frequency counting
-        candidates = {
-            'top': [], 'top+1': [],
-            'bot': [], 'bot-1': []
-        }
+        # Temporary storage for analysis, one parallel list per slot indexed by page:
+        # raw text, cleaned text and bbox, plus a running count per cleaned text.
+        # A page without a block in a slot holds '', '' and None.
+        slots = ('top', 'top+1', 'bot', 'bot-1')
 
         try:
-            doc = fitz.open(self.file_path)
+            doc = self.doc if self.doc is not None else fitz.open(self.file_path)
             self.number_of_pages = len(doc)
+            n_pages = self.number_of_pages
+
+            # Page count is known up front: size every slot list once, pre-filled as "no block"
+            texts = {key: [''] * n_pages for key in slots}
+            candidates = {key: [''] * n_pages for key in slots}
+            bboxes = {key: [None] * n_pages for key in slots}
+            # Frequencies are counted as the pages are stored: no second pass over the slots
+            counts = {key: {} for key in slots}
+
+            # Hot-loop lookups bound to locals once
+            clean = self.clean_text
+            intern = sys.intern
+            tops = table_tops(self.tables_y_coords, n_pages)
+            slot_lists = [
+                (texts[key], candidates[key], bboxes[key], counts[key], counts[key].get)
+                for key in slots
+            ]
             
-            for page_idx in range(self.number_of_pages):
-                page = doc[page_idx]
+            # --- 1. Block extraction + candidate selection (optionally across processes) ---
+            if self.max_workers == 1:
                 # get_text("blocks") returns: (x0, y0, x1, y1, "text", block_no, block_type)
-                blocks = page.get_text("blocks")
-                
-                # Filter: remove empty blocks and non-text
-                # Also clean internal newlines for consistency
-                valid_blocks = []
-                for b in blocks:
-                    text = b[4].strip()
-                    if text:
-                        valid_blocks.append(b)
-
-                if not valid_blocks:
-                    # Handle empty page
-                    page_data[page_idx] = {}
-                    self._fill_empty_candidates(candidates)
+                page_candidates = (
+                    select_page_candidates(page.get_text("blocks", flags=BLOCK_FLAGS), tops[page_idx])
+                    for page_idx, page in enumerate(doc)
+                )
+            else:
+                # Processes, not threads: PyMuPDF documents must not be shared across threads
+                workers = self.max_workers or os.cpu_count() or 1
+                # ~4 chunks per worker balances uneven pages against per-task IPC overhead
+                chunksize = max(1, n_pages // (workers * 4))
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_page_worker,
+                    initargs=(self.file_path, tops),
+                ) as ex:
+                    page_candidates = list(ex.map(_extract_page_candidates, range(n_pages), chunksize=chunksize))
+
+            for page_idx, picked in enumerate(page_candidates):
+                if picked is None:
+                    # Handle empty page: slots keep their defaults
                     continue
 
-                # --- 1. Identify Candidates (Optimization: use nsmallest/nlargest) ---
-                # Sort by y0 (top)
-                # We only need the top 2 and bottom 2, no need to sort the whole list if N is large.
-                # However, for typical PDFs (N < 100 blocks), sorted() is extremely fast.
-                by_top = sorted(valid_blocks, key=lambda b: b[1])
-                
-                # Check Table Overlap logic
-                # If the top block starts AFTER a table starts, it's likely body text, not header.
-                table_range = self.tables_y_coords.get(page_idx)
-                
-                top_blk = by_top[0]
-                top_plus_1_blk = by_top[1] if len(by_top) > 1 else None
-                
-                # Table overlap check (Top)
-                if table_range and top_blk[1] > table_range[0]:
-                    # The 'top' block is actually below the table start -> Invalid Header
-                    top_blk = None
-                    top_plus_1_blk = None
-                
-                # Bottom blocks (Sort by y1 descending)
-                by_bot = sorted(valid_blocks, key=lambda b: b[3], reverse=True)
-                bot_blk = by_bot[0]
-                bot_minus_1_blk = by_bot[1] if len(by_bot) > 1 else None
-                
-                # Table overlap check (Bottom) - if bottom block ends BEFORE table ends? 
-                # (Logic usually checks if footer is inside table, but we'll stick to basic existence)
-
                 # --- 2. Store Raw & Cleaned Text ---
                 # We store the cleaned version for frequency analysis, 
-                # but keep the block (with coords) for final extraction.
-                
-                p_store = {}
-                
-                if top_blk:
-                    c_text = self.clean_text(top_blk[4])
-                    candidates['top'].append(c_text)
-                    p_store['top'] = {'text': top_blk[4], 'clean': c_text, 'bbox': top_blk[:4]}
-                else:
-                    candidates['top'].append('')
-
-                if top_plus_1_blk:
-                    c_text = self.clean_text(top_plus_1_blk[4])
-                    candidates['top+1'].append(c_text)
-                    p_store['top+1'] = {'text': top_plus_1_blk[4], 'clean': c_text, 'bbox': top_plus_1_blk[:4]}
-                else:
-                    candidates['top+1'].append('')
-
-                if bot_blk:
-                    c_text = self.clean_text(bot_blk[4])
-                    candidates['bot'].append(c_text)
-                    p_store['bot'] = {'text': bot_blk[4], 'clean': c_text, 'bbox': bot_blk[:4]}
-                else:
-                    candidates['bot'].append('')
-
-                if bot_minus_1_blk:
-                    c_text = self.clean_text(bot_minus_1_blk[4])
-                    candidates['bot-1'].append(c_text)
-                    p_store['bot-1'] = {'text': bot_minus_1_blk[4], 'clean': c_text, 'bbox': bot_minus_1_blk[:4]}
-                else:
-                    candidates['bot-1'].append('')
-                
-                page_data[page_idx] = p_store
+                # but keep the block coords for final extraction.
+                # Cleaned text is interned: repeated headers share one string object.
+                for (slot_texts, slot_clean, slot_bboxes, slot_counts, count_of), blk in zip(slot_lists, picked):
+                    if blk:
+                        x0, y0, x1, y1, text, _, _ = blk
+                        c_text = intern(clean(text))
+                        slot_texts[page_idx] = text
+                        slot_clean[page_idx] = c_text
+                        slot_bboxes[page_idx] = (x0, y0, x1, y1)
+                        if c_text:
+                            slot_counts[c_text] = count_of(c_text, 0) + 1
 
             # --- 3. Frequency Analysis & Winner Selection ---
             
-            # Helper to get max freq
+            # Max freq per slot, read off the counts built during the page loop
             def get_freq(key):
-                common = self.get_most_common(candidates[key], 1)
-                return common[0][1] if common else 0
+                return max(counts[key].values(), default=0)
 
             top_freq = get_freq('top')
             top_p1_freq = get_freq('top+1')
@@ -246,48 +429,29 @@ class PDFHeaderFooterExtractor:
                     footer_source = 'bot-1'
 
             # --- 4. Final Construction ---
-            for i in range(self.number_of_pages):
-                data = page_data.get(i, {})
-                
-                # Retrieve Header
-                h_data = data.get(header_source)
-                if h_data:
-                    self.headers.append(h_data['text'])
-                    self.cleaned_headers.append(h_data['clean'])
-                    h_bbox = h_data['bbox']
-                else:
-                    self.headers.append('')
-                    self.cleaned_headers.append('')
-                    h_bbox = []
-
-                # Retrieve Footer
-                f_data = data.get(footer_source)
-                if f_data:
-                    self.footers.append(f_data['text'])
-                    self.cleaned_footers.append(f_data['clean'])
-                    f_bbox = f_data['bbox']
-                    
-                    # Image 5 Logic: Adjust footer bbox for redaction/visuals?
-                    # "rect.y0 + 15" implies expanding or shifting the box. 
-                    # We store the raw block bbox here. 
-                    # If specific modification is needed:
-                    if f_bbox:
-                         # Example adjustment based on Image 5
-                         f_bbox = list(f_bbox) # make mutable
-                         # f_bbox[1] += 15 # y0
-                         # f_bbox[3] += 15 # y1
-                else:
-                    self.footers.append('')
-                    self.cleaned_footers.append('')
-                    f_bbox = []
+            self.headers.extend(texts[header_source])
+            self.cleaned_headers.extend(candidates[header_source])
+            self.footers.extend(texts[footer_source])
+            self.cleaned_footers.extend(candidates[footer_source])
 
+            for i, (h_bbox, f_bbox) in enumerate(zip(bboxes[header_source], bboxes[footer_source])):
                 # Store result
                 # Format from Image 2: [header_rect, footer_rect]
-                # If missing, store empty string or list
+                # If missing, store empty list.
+                # Image 5 Logic ("rect.y0 + 15") is applied downstream; if it is ever
+                # needed here, shift as a new tuple: (x0, y0 + 15, x1, y1 + 15).
                 self.page_wise_coords[i] = [
-                    h_bbox if h_bbox else [], 
+                    h_bbox if h_bbox else [],
                     f_bbox if f_bbox else []
                 ]
+
+            nan = np.nan
+            self.header_y1 = np.fromiter(
+                (b[3] if b else nan for b in bboxes[header_source]), dtype=np.float64, count=n_pages
+            )
+            self.footer_y0 = np.fromiter(
+                (b[1] if b else nan for b in bboxes[footer_source]), dtype=np.float64, count=n_pages
+            )
             
             return self.headers, self.footers, self.page_wise_coords
 
@@ -295,10 +459,6 @@ class PDFHeaderFooterExtractor:
             print(f"Error extracting headers/footers: {e}")
             return [], [], {}
 
-    def _fill_empty_candidates(self, candidates_dict):
-        for k in candidates_dict:
-            candidates_dict[k].append('')
-
 # Usage Example
 # extractor = PDFHeaderFooterExtractor("doc.pdf")
 # headers, footers, coords = extractor.extract_headers_footers()
@@ -314,6 +474,10 @@ from typing import List, Dict, Any, Tuple
 # from your_module import PDFHeaderFooterExtractor, get_adi_results
 # from your_module import PDFProcessor, time_it, logger
 
+# Shared by every redaction annotation (white fill), and the page_map default
+REDACT_FILL = (1, 1, 1)
+_NO_BBOXES = (None, None)
+
 class RedactionPDFProcessor(PDFProcessor):
     """
     PDF processor that removes headers and footers using redaction.
@@ -348,7 +512,8 @@ class RedactionPDFProcessor(PDFProcessor):
             page_width = first_page_rect.width
 
             # 4. Extract Headers/Footers (Optimized Single Pass)
-            extractor = PDFHeaderFooterExtractor(pdf_path, tables_y_coords)
+            # Shares the document opened above: MuPDF parses the file once
+            extractor = PDFHeaderFooterExtractor(pdf_path, tables_y_coords, doc=doc)
             
             # Returns raw lists and the coordinate map: {page_idx: [header_bbox, footer_bbox]}
             headers, footers, page_map = extractor.extract_headers_footers()
@@ -359,47 +524,56 @@ class RedactionPDFProcessor(PDFProcessor):
             
             # 5. Frequency Analysis (Determine "Possible" headers/footers)
             # Filter empty strings for stats
-            valid_headers = [h for h in cleaned_headers if h]
-            valid_footers = [f for f in cleaned_footers if f]
+            header_counts = Counter(filter(None, cleaned_headers))
+            footer_counts = Counter(filter(None, cleaned_footers))
 
-            header_counts = Counter(valid_headers)
-            footer_counts = Counter(valid_footers)
+            # Most common text per side, computed once: its count decides whether any
+            # text clears the threshold, and it is reused for the final log line
+            header_top = header_counts.most_common(1)
+            footer_top = footer_counts.most_common(1)
+            has_header_margin = bool(header_top) and header_top[0][1] > header_count_threshold
+            has_footer_margin = bool(footer_top) and footer_top[0][1] > footer_count_threshold
 
             # Identify text that appears frequently enough to be considered a generic header/footer
             possible_headers = {
                 h for h, count in header_counts.items() 
                 if count > header_count_threshold
-            }
+            } if has_header_margin else set()
             possible_footers = {
                 f for f, count in footer_counts.items() 
                 if count > footer_count_threshold
-            }
-
-            has_header_margin = bool(possible_headers)
-            has_footer_margin = bool(possible_footers)
+            } if has_footer_margin else set()
 
             # 6. Calculate Default Margins (Modes)
             # We need a fallback Y-coordinate if a specific page doesn't have a specific text match
             # but we still want to redact (e.g., based on the "average" header location).
             
-            # Extract Y-bottom (y1) for headers and Y-top (y0) for footers from the page_map
-            # page_map structure: { page_idx: [ [h_x0, h_y0, h_x1, h_y1], ... ] }
-            
-            all_header_y1 = [
-                coords[0][3] for coords in page_map.values() 
-                if coords[0] # Ensure bbox exists
-            ]
-            all_footer_y0 = [
-                coords[1][1] for coords in page_map.values() 
-                if coords[1]
-            ]
-
-            # Helper to find mode
-            def get_mode(values, default):
-                return Counter(values).most_common(1)[0][0] if values else default
-
-            result_header_y = get_mode(all_header_y1, default=50)
-            result_footer_y = get_mode(all_footer_y0, default=page_height - 50)
+            # Y-bottom (y1) for headers and Y-top (y0) for footers, taken from the extractor's
+            # per-page columns of page_map (NaN = no bbox on that page)
+            all_header_y1 = extractor.header_y1[~np.isnan(extractor.header_y1)]
+            all_footer_y0 = extractor.footer_y0[~np.isnan(extractor.footer_y0)]
+
+            # Helper to find mode. Coordinates are binned to whole points first, so
+            # sub-point jitter across pages still votes for the same margin; bincount
+            # over the offset integer range then counts every value in one C pass.
+            # The margin returned is the outermost raw value of the winning bin (largest
+            # header y1 / smallest footer y0), and tied bins resolve outward as well,
+            # so binning never redacts less than the exact coordinates would.
+            def get_mode(values, default, is_header):
+                if not values.size:
+                    return default
+                bins = np.rint(values).astype(np.intp)
+                low = bins.min()
+                counts = np.bincount(bins - low)
+                if is_header:
+                    # Last of the tied bins: the deepest header edge
+                    winner = len(counts) - 1 - counts[::-1].argmax() + low
+                    return float(values[bins == winner].max())
+                winner = counts.argmax() + low
+                return float(values[bins == winner].min())
+
+            result_header_y = get_mode(all_header_y1, default=50, is_header=True)
+            result_footer_y = get_mode(all_footer_y0, default=page_height - 50, is_header=False)
 
             # 7. Apply Geometric Business Logic (Safety Checks)
             # If calculated header is too low (>10% of page), reset to default
@@ -421,8 +595,11 @@ class RedactionPDFProcessor(PDFProcessor):
             # 8. Redaction Loop
             for page_index in range(len(doc)):
                 page = doc[page_index]
-                p_height = page.rect.height
-                p_width = page.rect.width
+                # One page.rect read per page (each access builds a new Rect from MuPDF)
+                p_rect = page.rect
+                p_height = p_rect.height
+                p_width = p_rect.width
+                current_h_bbox, current_f_bbox = page_map.get(page_index, _NO_BBOXES)
 
                 # --- Header Redaction ---
                 header_rect = None
@@ -430,7 +607,6 @@ class RedactionPDFProcessor(PDFProcessor):
                 # A. Specific Text Match
                 # If the text found on this page is in our list of "frequent headers"
                 current_h_text = cleaned_headers[page_index]
-                current_h_bbox = page_map.get(page_index, [None, None])[0]
 
                 if has_header_margin and (current_h_text in possible_headers) and current_h_bbox:
                     # Use the specific bounding box found for this text
@@ -450,14 +626,13 @@ class RedactionPDFProcessor(PDFProcessor):
                     header_rect = fitz.Rect(0, 0, p_width, result_header_y)
 
                 if header_rect:
-                    page.add_redact_annot(header_rect, fill=(1, 1, 1))
+                    page.add_redact_annot(header_rect, fill=REDACT_FILL)
 
 
                 # --- Footer Redaction ---
                 footer_rect = None
                 
                 current_f_text = cleaned_footers[page_index]
-                current_f_bbox = page_map.get(page_index, [None, None])[1]
 
                 # A. Specific Text Match
                 if has_footer_margin and (current_f_text in possible_footers) and current_f_bbox:
@@ -477,10 +652,12 @@ class RedactionPDFProcessor(PDFProcessor):
                     footer_rect = fitz.Rect(0, result_footer_y, p_width, p_height)
 
                 if footer_rect:
-                    page.add_redact_annot(footer_rect, fill=(1, 1, 1))
+                    page.add_redact_annot(footer_rect, fill=REDACT_FILL)
 
-                # Apply redactions immediately for this page (memory efficient)
-                page.apply_redactions()
+                # Apply redactions immediately for this page (memory efficient);
+                # nothing to apply -> skip MuPDF's content-stream rewrite
+                if header_rect or footer_rect:
+                    page.apply_redactions()
 
             # 9. Save and Close
             doc.save(output_pdf_path, garbage=4, deflate=True)
@@ -488,8 +665,8 @@ class RedactionPDFProcessor(PDFProcessor):
 
             # 10. Final Logging
             # Get most common content for logs
-            final_h_content = header_counts.most_common(1)[0][0] if header_counts else ""
-            final_f_content = footer_counts.most_common(1)[0][0] if footer_counts else ""
+            final_h_content = header_top[0][0] if header_top else ""
+            final_f_content = footer_top[0][0] if footer_top else ""
             
             output_line = (
                 f"{os.path.basename(pdf_path)}; \n header_margin = {result_header_y}; "
@@ -1,13 +1,173 @@
 import os
 import fitz  # PyMuPDF
 from collections import Counter
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, NamedTuple, Set
 
 # Assuming these imports exist in your project structure
 # from modules.pdf_extractor import PDFHeaderFooterExtractor
 # from modules.adi_helper import get_adi_results
 # from modules.base import PDFProcessor, time_it, logger
 
+# Below this many pages the pool start-up and the final page merge cost more than they save
+MIN_PARALLEL_PAGES = 32
+
+# Catalog entries that the page-range split/merge of the parallel path would drop
+# (forms, named destinations/embedded files, page labels, optional content layers)
+DOCUMENT_LEVEL_KEYS = ("AcroForm", "Names", "Dests", "PageLabels", "OCProperties")
+
+
+class RedactionPlan(NamedTuple):
+    """Document-level decisions made once in process() and applied to every page."""
+    cleaned_headers: List[str]
+    cleaned_footers: List[str]
+    page_map: Dict[int, List[Any]]
+    page_numbers_y_coords: Dict[int, float]
+    header_counts: Counter
+    footer_counts: Counter
+    possible_headers: Set[str]
+    possible_footers: Set[str]
+    has_header_margin: bool
+    has_footer_margin: bool
+    header_count_threshold: int
+    footer_count_threshold: int
+    result_header_y: float
+    result_footer_y: float
+
+
+def redact_page(page, page_index: int, plan: RedactionPlan):
+    """Adds and applies the header/footer redactions of one page."""
+    (cleaned_headers, cleaned_footers, page_map, page_numbers_y_coords,
+     header_counts, footer_counts, possible_headers, possible_footers,
+     has_header_margin, has_footer_margin, header_count_threshold, footer_count_threshold,
+     result_header_y, result_footer_y) = plan
+    # One page.rect read per page (each access builds a new Rect from MuPDF)
+    p_rect = page.rect
+    p_width = p_rect.width
+    p_height = p_rect.height
+
+    # Retrieve extraction data for this page
+    current_h_text = cleaned_headers[page_index]
+    current_f_text = cleaned_footers[page_index]
+    
+    # BBoxes: [x0, y0, x1, y1]
+    # page_map.get might return None if page was empty
+    coords = page_map.get(page_index, [None, None])
+    current_h_bbox = coords[0]
+    current_f_bbox = coords[1]
+
+    # ==================================================
+    # HEADER LOGIC (With "Title Protection")
+    # ==================================================
+    header_rect = None
+    
+    # Check frequency of the specific text found on this page
+    h_count = header_counts.get(current_h_text, 0)
+
+    # Case A: High-Frequency Header (Safe to delete)
+    if has_header_margin and (current_h_text in possible_headers) and current_h_bbox:
+        # Redact exactly what we found + 2px buffer
+        header_rect = fitz.Rect(0, 0, p_width, current_h_bbox[3] + 2)
+    
+    # Case B: Page Number (Verified by Azure)
+    elif (page_index + 1) in page_numbers_y_coords:
+        p_num_y = page_numbers_y_coords[page_index + 1]
+        # Only if it's actually at the top
+        if p_num_y < (0.10 * p_height):
+            header_rect = fitz.Rect(0, 0, p_width, p_num_y + 2)
+
+    # Case C: Fallback / Default Margin
+    # CRITICAL CHANGE: Only apply blind margin if text is NOT unique.
+    elif has_header_margin:
+        # If we found text, but it appears rarely (<= threshold), it is likely a 
+        # Section Title (e.g., "Schedule of Covered Benefits"). DO NOT REDACT.
+        if current_h_text and h_count <= header_count_threshold:
+            # Log identifying we skipped a title
+            # logger.debug(f"Page {page_index}: Skipping header redaction for title: '{current_h_text}'")
+            header_rect = None 
+        else:
+            # Text is empty, or garbage, or we just missed the exact bbox match.
+            # Apply safe default margin.
+            header_rect = fitz.Rect(0, 0, p_width, result_header_y)
+
+    if header_rect:
+        page.add_redact_annot(header_rect, fill=(1, 1, 1))
+
+    # ==================================================
+    # FOOTER LOGIC
+    # ==================================================
+    footer_rect = None
+    f_count = footer_counts.get(current_f_text, 0)
+
+    # Case A: High-Frequency Footer
+    if has_footer_margin and (current_f_text in possible_footers) and current_f_bbox:
+        # Redact from top of footer text to bottom of page
+        footer_rect = fitz.Rect(0, current_f_bbox[1] - 2, p_width, p_height)
+
+    # Case B: Page Number (Verified by Azure)
+    elif (page_index + 1) in page_numbers_y_coords:
+        p_num_y = page_numbers_y_coords[page_index + 1]
+        # Only if it's actually at the bottom
+        if p_num_y > (0.85 * p_height):
+            footer_rect = fitz.Rect(0, p_num_y - 2, p_width, p_height)
+
+    # Case C: Fallback
+    elif has_footer_margin:
+        # Similar protection: If unique text is at the bottom, it might be a specific footnote.
+        # However, footers are less likely to be titles. We apply stricter check.
+        if current_f_text and f_count <= footer_count_threshold:
+            footer_rect = None
+        else:
+            footer_rect = fitz.Rect(0, result_footer_y, p_width, p_height)
+
+    if footer_rect:
+        page.add_redact_annot(footer_rect, fill=(1, 1, 1))
+
+    # Commit redactions for this page to free memory; pages without any rect skip MuPDF's
+    # content-stream rewrite entirely
+    if header_rect or footer_rect:
+        page.apply_redactions()
+
+
+def can_redact_in_parallel(doc) -> bool:
+    """
+    True if splitting doc into page ranges and merging them back loses nothing: no
+    document-level catalog entries (DOCUMENT_LEVEL_KEYS) and no links between pages.
+    Metadata, XMP and the outline are copied over by process(); shared fonts/images
+    are still written once per range and only deduplicated again by save(garbage=4).
+    """
+    catalog = doc.pdf_catalog()
+    if any(doc.xref_get_key(catalog, key)[0] != "null" for key in DOCUMENT_LEVEL_KEYS):
+        return False
+    for page in doc:
+        link = page.first_link
+        while link:
+            # Internal (goto/named) links may point into another range and would be lost
+            if not link.is_external:
+                return False
+            link = link.next
+    return True
+
+
+# --- Process-pool workers: each worker opens the PDF once and redacts whole page ranges ---
+_worker_doc = None
+_worker_plan = None
+
+def _init_redaction_worker(pdf_path: str, plan: RedactionPlan):
+    global _worker_doc, _worker_plan
+    _worker_doc = fitz.open(pdf_path)
+    _worker_plan = plan
+
+def _redact_page_range(page_range: Tuple[int, int]) -> bytes:
+    # Redacts pages [start, stop) and returns them as a standalone PDF
+    start, stop = page_range
+    for page_index in range(start, stop):
+        redact_page(_worker_doc[page_index], page_index, _worker_plan)
+    part = fitz.open()
+    part.insert_pdf(_worker_doc, from_page=start, to_page=stop - 1)
+    return part.tobytes()
+
+
 class RedactionPDFProcessor(PDFProcessor):
     """
     PDF processor that removes headers and footers using redaction.
@@ -43,7 +203,8 @@ class RedactionPDFProcessor(PDFProcessor):
             page_width = first_page_rect.width
 
             # 4. Extract Headers/Footers (Single Pass Optimization)
-            extractor = PDFHeaderFooterExtractor(pdf_path, tables_y_coords)
+            # Reuses the document opened above instead of parsing the PDF a second time
+            extractor = PDFHeaderFooterExtractor(pdf_path, tables_y_coords, doc=doc)
             
             # page_map structure: { page_index: [header_bbox_list, footer_bbox_list] }
             # headers/footers lists contain the raw text found at top/bottom
@@ -54,11 +215,9 @@ class RedactionPDFProcessor(PDFProcessor):
             cleaned_footers = extractor.cleaned_footers
             
             # 5. Frequency Analysis
-            valid_headers = [h for h in cleaned_headers if h]
-            valid_footers = [f for f in cleaned_footers if f]
-
-            header_counts = Counter(valid_headers)
-            footer_counts = Counter(valid_footers)
+            # Empty slots are skipped while counting (no filtered copies of the lists)
+            header_counts = Counter(filter(None, cleaned_headers))
+            footer_counts = Counter(filter(None, cleaned_footers))
 
             # Identify "True" Headers/Footers (high frequency)
             possible_headers = {
@@ -76,19 +235,19 @@ class RedactionPDFProcessor(PDFProcessor):
             # 6. Calculate Default Geometric Margins (Modes)
             # Used as fallback coordinates if specific bounding boxes aren't found
             
-            all_header_y1 = [
-                coords[0][3] for coords in page_map.values() if coords[0]
-            ]
-            all_footer_y0 = [
-                coords[1][1] for coords in page_map.values() if coords[1]
-            ]
-
-            def get_mode(values, default):
-                return Counter(values).most_common(1)[0][0] if values else default
+            # One pass over page_map tallies header bottoms (y1) and footer tops (y0)
+            header_y1_counts = {}
+            footer_y0_counts = {}
+            for h_bbox, f_bbox in page_map.values():
+                if h_bbox:
+                    header_y1_counts[h_bbox[3]] = header_y1_counts.get(h_bbox[3], 0) + 1
+                if f_bbox:
+                    footer_y0_counts[f_bbox[1]] = footer_y0_counts.get(f_bbox[1], 0) + 1
 
+            # Mode (first-seen value wins ties, as with Counter.most_common)
             # Default: Header ends at 50px, Footer starts at Bottom - 50px
-            result_header_y = get_mode(all_header_y1, default=50)
-            result_footer_y = get_mode(all_footer_y0, default=page_height - 50)
+            result_header_y = max(header_y1_counts, key=header_y1_counts.get) if header_y1_counts else 50
+            result_footer_y = max(footer_y0_counts, key=footer_y0_counts.get) if footer_y0_counts else page_height - 50
 
             # 7. Safety Constraints
             # If header calculation is crazy deep (>10% of page), reset to safe default
@@ -100,90 +259,45 @@ class RedactionPDFProcessor(PDFProcessor):
                 result_footer_y = page_height - 50
 
             # 8. Redaction Loop
-            for page_index in range(len(doc)):
-                page = doc[page_index]
-                p_width = page.rect.width
-                p_height = page.rect.height
-
-                # Retrieve extraction data for this page
-                current_h_text = cleaned_headers[page_index]
-                current_f_text = cleaned_footers[page_index]
-                
-                # BBoxes: [x0, y0, x1, y1]
-                # page_map.get might return None if page was empty
-                coords = page_map.get(page_index, [None, None])
-                current_h_bbox = coords[0]
-                current_f_bbox = coords[1]
-
-                # ==================================================
-                # HEADER LOGIC (With "Title Protection")
-                # ==================================================
-                header_rect = None
-                
-                # Check frequency of the specific text found on this page
-                h_count = header_counts.get(current_h_text, 0)
-
-                # Case A: High-Frequency Header (Safe to delete)
-                if has_header_margin and (current_h_text in possible_headers) and current_h_bbox:
-                    # Redact exactly what we found + 2px buffer
-                    header_rect = fitz.Rect(0, 0, p_width, current_h_bbox[3] + 2)
-                
-                # Case B: Page Number (Verified by Azure)
-                elif (page_index + 1) in page_numbers_y_coords:
-                    p_num_y = page_numbers_y_coords[page_index + 1]
-                    # Only if it's actually at the top
-                    if p_num_y < (0.10 * p_height):
-                        header_rect = fitz.Rect(0, 0, p_width, p_num_y + 2)
-
-                # Case C: Fallback / Default Margin
-                # CRITICAL CHANGE: Only apply blind margin if text is NOT unique.
-                elif has_header_margin:
-                    # If we found text, but it appears rarely (<= threshold), it is likely a 
-                    # Section Title (e.g., "Schedule of Covered Benefits"). DO NOT REDACT.
-                    if current_h_text and h_count <= header_count_threshold:
-                        # Log identifying we skipped a title
-                        # logger.debug(f"Page {page_index}: Skipping header redaction for title: '{current_h_text}'")
-                        header_rect = None 
-                    else:
-                        # Text is empty, or garbage, or we just missed the exact bbox match.
-                        # Apply safe default margin.
-                        header_rect = fitz.Rect(0, 0, p_width, result_header_y)
-
-                if header_rect:
-                    page.add_redact_annot(header_rect, fill=(1, 1, 1))
-
-                # ==================================================
-                # FOOTER LOGIC
-                # ==================================================
-                footer_rect = None
-                f_count = footer_counts.get(current_f_text, 0)
-
-                # Case A: High-Frequency Footer
-                if has_footer_margin and (current_f_text in possible_footers) and current_f_bbox:
-                    # Redact from top of footer text to bottom of page
-                    footer_rect = fitz.Rect(0, current_f_bbox[1] - 2, p_width, p_height)
-
-                # Case B: Page Number (Verified by Azure)
-                elif (page_index + 1) in page_numbers_y_coords:
-                    p_num_y = page_numbers_y_coords[page_index + 1]
-                    # Only if it's actually at the bottom
-                    if p_num_y > (0.85 * p_height):
-                        footer_rect = fitz.Rect(0, p_num_y - 2, p_width, p_height)
-
-                # Case C: Fallback
-                elif has_footer_margin:
-                    # Similar protection: If unique text is at the bottom, it might be a specific footnote.
-                    # However, footers are less likely to be titles. We apply stricter check.
-                    if current_f_text and f_count <= footer_count_threshold:
-                        footer_rect = None
-                    else:
-                        footer_rect = fitz.Rect(0, result_footer_y, p_width, p_height)
-
-                if footer_rect:
-                    page.add_redact_annot(footer_rect, fill=(1, 1, 1))
-
-                # Commit redactions for this page to free memory
-                page.apply_redactions()
+            plan = RedactionPlan(
+                cleaned_headers, cleaned_footers, page_map, page_numbers_y_coords,
+                header_counts, footer_counts, possible_headers, possible_footers,
+                has_header_margin, has_footer_margin, header_count_threshold, footer_count_threshold,
+                result_header_y, result_footer_y,
+            )
+            n_pages = len(doc)
+            # Redaction worker processes (1 = in-process). Pages are independent, so ranges are
+            # redacted in separate processes on their own handles and merged back in order.
+            # The merge does not preserve document-level structure (forms, named destinations,
+            # page labels, layers, cross-range links): such documents are always redacted in-process.
+            workers = int(os.environ.get("redaction_workers", 1))
+
+            if workers > 1 and n_pages >= MIN_PARALLEL_PAGES and can_redact_in_parallel(doc):
+                # ~2 ranges per worker: balances uneven pages while keeping the merge short
+                step = -(-n_pages // (workers * 2))
+                page_ranges = [(start, min(start + step, n_pages)) for start in range(0, n_pages, step)]
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_redaction_worker,
+                    initargs=(pdf_path, plan),
+                ) as ex:
+                    parts = list(ex.map(_redact_page_range, page_ranges))
+
+                redacted = fitz.open()
+                for part in parts:
+                    with fitz.open("pdf", part) as part_doc:
+                        redacted.insert_pdf(part_doc)
+                # Page ranges carry no document-level data: copy metadata, XMP and outline over
+                redacted.set_metadata(doc.metadata)
+                xml_metadata = doc.get_xml_metadata()
+                if xml_metadata:
+                    redacted.set_xml_metadata(xml_metadata)
+                redacted.set_toc(doc.get_toc(simple=False))
+                doc.close()
+                doc = redacted
+            else:
+                for page_index in range(n_pages):
+                    redact_page(doc[page_index], page_index, plan)
 
             # 9. Save & Close
             doc.save(output_pdf_path, garbage=4, deflate=True)
@@ -1,14 +1,99 @@
 import fitz  # PyMuPDF
 import re
+import functools
+import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from typing import List, Dict, Any, Tuple, Optional
 
+
+def table_tops(tables_y_coords, n_pages):
+    """
+    Flattens {page_idx: [table_y_min, table_y_max]} into a per-page list of table_y_min,
+    +inf for pages without a table, so the per-page overlap check is one float compare.
+    """
+    tops = [float('inf')] * n_pages
+    for page_idx, table_range in tables_y_coords.items():
+        if table_range and 0 <= page_idx < n_pages:
+            tops[page_idx] = table_range[0]
+    return tops
+
+
+# Image blocks are never header/footer text: dropping TEXT_PRESERVE_IMAGES keeps MuPDF from
+# building them (and their "<image: ...>" placeholder text) in the first place
+BLOCK_FLAGS = fitz.TEXTFLAGS_BLOCKS & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Digit test for the signature pipeline: set lookup for ASCII text, regex (Unicode \d) otherwise
+_ASCII_DIGITS = frozenset('0123456789')
+_find_digit = re.compile(r'\d').search
+
+
+def select_page_blocks(blocks, table_top):
+    """
+    Picks the (top, top+1, bot, bot-1) blocks of one page from its get_text("blocks") output.
+    table_top is the page's first table y (+inf without tables).
+    Returns None when the page has no non-empty blocks.
+    """
+    # --- 1. Identify Candidates (Top 2 and Bottom 2) ---
+    # One pass tracks the two smallest y0 and two largest y1 while
+    # skipping empty blocks; strict comparisons keep page order on ties.
+    top_blk = top_plus_1_blk = bot_blk = bot_minus_1_blk = None
+    for b in blocks:
+        # Filter: remove empty blocks (non-text is already dropped by BLOCK_FLAGS)
+        if not b[4].strip():
+            continue
+        y0 = b[1]
+        y1 = b[3]
+        if top_blk is None or y0 < top_blk[1]:
+            top_plus_1_blk = top_blk
+            top_blk = b
+        elif top_plus_1_blk is None or y0 < top_plus_1_blk[1]:
+            top_plus_1_blk = b
+        if bot_blk is None or y1 > bot_blk[3]:
+            bot_minus_1_blk = bot_blk
+            bot_blk = b
+        elif bot_minus_1_blk is None or y1 > bot_minus_1_blk[3]:
+            bot_minus_1_blk = b
+
+    if top_blk is None:
+        return None
+
+    # Check Table Overlap logic
+    # If top block starts AFTER a table starts, it's body text.
+    if top_blk[1] > table_top:
+        top_blk = None
+        top_plus_1_blk = None
+
+    return top_blk, top_plus_1_blk, bot_blk, bot_minus_1_blk
+
+
+# --- Process-pool workers: each worker opens the PDF once and serves many pages ---
+_worker_doc = None
+_worker_table_tops: List[float] = []
+
+def _init_page_worker(file_path: str, table_tops: List[float]):
+    global _worker_doc, _worker_table_tops
+    _worker_doc = fitz.open(file_path)
+    _worker_table_tops = table_tops
+
+def _select_page_blocks(page_idx: int):
+    return select_page_blocks(_worker_doc[page_idx].get_text("blocks", flags=BLOCK_FLAGS), _worker_table_tops[page_idx])
+
+
 class PDFHeaderFooterExtractor:
     """
     Optimized class to extract headers, footers, and their positions from PDFs.
     Uses 'Tokenization/Masking' to normalize text for accurate frequency analysis.
     """
 
+    # One extractor per PDF: fixed instance attributes, no per-instance __dict__
+    __slots__ = (
+        'file_path', 'tables_y_coords', 'max_workers',
+        'headers', 'footers', 'frequency_signatures_headers', 'frequency_signatures_footers',
+        'number_of_pages', 'page_wise_coords',
+    )
+
     # --- Constants & Regex (Compiled once for performance) ---
     
     # 1. URLs and Emails -> <LINK>
@@ -53,9 +138,29 @@ class PDFHeaderFooterExtractor:
         (PAT_SEPARATORS, ' '), 
     ]
 
-    def __init__(self, file_path: str, tables_y_coords: Dict[int, List[float]] = None):
+    # Cheap pre-checks per stage: (match needs a digit, characters the match must contain at
+    # least one of, or None). A stage that cannot match is skipped without a regex scan;
+    # replacements never add digits, so one digit test up front covers every stage.
+    PIPELINE_GUARDS = [
+        (False, frozenset('@.:')),  # LINK: '@', 'www.' or '://'
+        (True, None),               # DATE
+        (True, frozenset(':')),     # TIME
+        (True, None),               # PAGE_TEXT
+        (True, None),               # PAGINATION
+        (True, frozenset('$€£')),   # MONEY
+        (True, None),               # NUM
+        (False, frozenset('_-*=')), # SEPARATORS
+    ]
+    GUARDED_PIPELINE = [
+        (pattern, replacement, needs_digit, chars)
+        for (pattern, replacement), (needs_digit, chars) in zip(CLEANING_PIPELINE, PIPELINE_GUARDS)
+    ]
+
+    def __init__(self, file_path: str, tables_y_coords: Dict[int, List[float]] = None, max_workers: Optional[int] = 1):
         self.file_path = file_path
         self.tables_y_coords = tables_y_coords if tables_y_coords else {}
+        # Page block extraction: 1 = in-process, None = all cores, N = N worker processes
+        self.max_workers = max_workers
         
         # Results
         self.headers: List[str] = []
@@ -72,10 +177,13 @@ class PDFHeaderFooterExtractor:
 
     # --- Helper Methods ---
 
-    def get_frequency_signature(self, text: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def get_frequency_signature(text: str) -> str:
         """
         Transforms raw text into a structural signature for frequency counting.
         Ex: "Report 2023 - Page 1" -> "report <NUM> - <PAGE>"
+        Pure function of the text, so repeated headers/footers hit the LRU cache.
         """
         if not text: 
             return ""
@@ -83,23 +191,25 @@ class PDFHeaderFooterExtractor:
         # 1. Normalize whitespace first
         clean = text.strip()
         
-        # 2. Apply Tokenization Pipeline
-        for pattern, replacement in self.CLEANING_PIPELINE:
+        # 2. Apply Tokenization Pipeline (skipping stages that cannot match)
+        if clean.isascii():
+            has_digit = not _ASCII_DIGITS.isdisjoint(clean)
+        else:
+            has_digit = _find_digit(clean) is not None
+        for pattern, replacement, needs_digit, chars in PDFHeaderFooterExtractor.GUARDED_PIPELINE:
+            if (needs_digit and not has_digit) or (chars is not None and chars.isdisjoint(clean)):
+                continue
             clean = pattern.sub(replacement, clean)
             
         # 3. Final cleanup
         # Lowercase for case-insensitive matching
         clean = clean.lower()
-        # Collapse multiple spaces
-        clean = re.sub(r'\s+', ' ', clean).strip()
+        # Collapse multiple spaces (split() drops leading/trailing whitespace too; it splits
+        # on exactly the characters \s matches)
+        clean = ' '.join(clean.split())
         
         return clean
 
-    def get_most_common(self, data: List[str], n: int = 2) -> List[Tuple[str, int]]:
-        """Efficiently gets top N most common signatures excluding empty strings."""
-        valid_items = [x for x in data if x]
-        return Counter(valid_items).most_common(n)
-
     # --- Main Extraction Logic ---
 
     def extract_headers_footers(self):
@@ -107,90 +217,68 @@ class PDFHeaderFooterExtractor:
         Extracts headers/footers by identifying top/bottom text blocks and 
         comparing their 'frequency signatures' across the document.
         """
-        # Data storage: {page_index: {'top': {...}, 'top+1': {...}, ...}}
-        page_data = {} 
-        
-        # Frequency Candidates (Store the *Signatures* here, not raw text)
-        candidates = {
-            'top': [], 'top+1': [],
-            'bot': [], 'bot-1': []
-        }
+        slots = ('top', 'top+1', 'bot', 'bot-1')
 
         try:
             doc = fitz.open(self.file_path)
             self.number_of_pages = len(doc)
+            n_pages = self.number_of_pages
+
+            # Data storage: one list per slot, indexed by page (no per-page dicts).
+            # A page without a block in a slot keeps '' / '' / None. The raw block
+            # tuple is kept as-is; only the two winning slots are sliced to bboxes.
+            texts = {key: [''] * n_pages for key in slots}
+            # Frequency Candidates (Store the *Signatures* here, not raw text)
+            candidates = {key: [''] * n_pages for key in slots}
+            bboxes = {key: [None] * n_pages for key in slots}
             
-            for page_idx in range(self.number_of_pages):
-                page = doc[page_idx]
-                blocks = page.get_text("blocks")
-                
-                # Filter: remove empty blocks and non-text
-                valid_blocks = []
-                for b in blocks:
-                    text = b[4].strip()
-                    if text:
-                        valid_blocks.append(b)
-
-                if not valid_blocks:
-                    page_data[page_idx] = {}
-                    self._fill_empty_candidates(candidates)
+            # Loop-invariant lookups bound once
+            tops = table_tops(self.tables_y_coords, n_pages)
+            signature = self.get_frequency_signature
+
+            # --- 1. Block extraction + candidate selection (optionally across processes) ---
+            if self.max_workers == 1:
+                # Pages are read sequentially from the document
+                page_blocks = (
+                    select_page_blocks(page.get_text("blocks", flags=BLOCK_FLAGS), tops[page_idx])
+                    for page_idx, page in enumerate(doc)
+                )
+            else:
+                # Processes, not threads: PyMuPDF documents must not be shared across threads
+                workers = self.max_workers or os.cpu_count() or 1
+                # ~4 chunks per worker balances uneven pages against per-task IPC overhead
+                chunksize = max(1, n_pages // (workers * 4))
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_page_worker,
+                    initargs=(self.file_path, tops),
+                ) as ex:
+                    page_blocks = list(ex.map(_select_page_blocks, range(n_pages), chunksize=chunksize))
+
+            for page_idx, picked in enumerate(page_blocks):
+                if picked is None:
+                    # Empty page: slots keep their defaults
                     continue
 
-                # --- 1. Identify Candidates (Top 2 and Bottom 2) ---
-                
-                # Sort by y0 (Top)
-                by_top = sorted(valid_blocks, key=lambda b: b[1])
-                
-                # Check Table Overlap logic
-                table_range = self.tables_y_coords.get(page_idx)
-                
-                top_blk = by_top[0]
-                top_plus_1_blk = by_top[1] if len(by_top) > 1 else None
-                
-                # If top block starts AFTER a table starts, it's body text.
-                if table_range and top_blk[1] > table_range[0]:
-                    top_blk = None
-                    top_plus_1_blk = None
-                
-                # Sort by y1 descending (Bottom)
-                by_bot = sorted(valid_blocks, key=lambda b: b[3], reverse=True)
-                bot_blk = by_bot[0]
-                bot_minus_1_blk = by_bot[1] if len(by_bot) > 1 else None
-                
                 # --- 2. Process Blocks & Generate Signatures ---
                 
-                p_store = {}
-                
-                def process_block(key, block):
+                for key, block in zip(slots, picked):
                     if block:
                         raw_text = block[4].strip().replace('\n', ' ')
+                        texts[key][page_idx] = raw_text
                         # Create signature (e.g., "page <NUM>")
-                        sig = self.get_frequency_signature(raw_text)
-                        
-                        candidates[key].append(sig)
-                        p_store[key] = {
-                            'text': raw_text, 
-                            'signature': sig, 
-                            'bbox': list(block[:4])
-                        }
-                    else:
-                        candidates[key].append('')
-                        p_store[key] = None
-
-                process_block('top', top_blk)
-                process_block('top+1', top_plus_1_blk)
-                process_block('bot', bot_blk)
-                process_block('bot-1', bot_minus_1_blk)
-                
-                page_data[page_idx] = p_store
+                        candidates[key][page_idx] = signature(raw_text)
+                        bboxes[key][page_idx] = block
 
             # --- 3. Frequency Analysis (on Signatures) ---
             
             def get_freq_count(key):
                 # Returns the count of the most common signature for this position
-                common = self.get_most_common(candidates[key], 1)
-                if not common: return 0, ""
-                return common[0][1], common[0][0] # count, signature_text
+                # (empty slots skipped; a max scan instead of most_common's heapq.nlargest)
+                counts = Counter(filter(None, candidates[key]))
+                if not counts: return 0, ""
+                sig, count = max(counts.items(), key=itemgetter(1))
+                return count, sig # count, signature_text
 
             top_count, top_sig = get_freq_count('top')
             top_p1_count, top_p1_sig = get_freq_count('top+1')
@@ -233,36 +321,17 @@ class PDFHeaderFooterExtractor:
                 footer_source = 'bot-1'
 
             # --- 5. Compile Final Results ---
-            for i in range(self.number_of_pages):
-                data = page_data.get(i, {})
-                
-                # HEADER
-                h_obj = data.get(header_source)
-                # Only accept if the signature matches the "winner" signature
-                # (Optional: Or just take whatever is in that slot for the page)
-                if h_obj:
-                    self.headers.append(h_obj['text'])
-                    self.frequency_signatures_headers.append(h_obj['signature'])
-                    h_bbox = h_obj['bbox']
-                else:
-                    self.headers.append('')
-                    self.frequency_signatures_headers.append('')
-                    h_bbox = []
-
-                # FOOTER
-                f_obj = data.get(footer_source)
-                if f_obj:
-                    self.footers.append(f_obj['text'])
-                    self.frequency_signatures_footers.append(f_obj['signature'])
-                    f_bbox = f_obj['bbox']
-                else:
-                    self.footers.append('')
-                    self.frequency_signatures_footers.append('')
-                    f_bbox = []
+            # Take whatever is in the winning slot for each page
+            # (Optional: only accept it if the signature matches the "winner" signature)
+            self.headers.extend(texts[header_source])
+            self.frequency_signatures_headers.extend(candidates[header_source])
+            self.footers.extend(texts[footer_source])
+            self.frequency_signatures_footers.extend(candidates[footer_source])
 
+            for i, (h_blk, f_blk) in enumerate(zip(bboxes[header_source], bboxes[footer_source])):
                 self.page_wise_coords[i] = [
-                    h_bbox if h_bbox else [], 
-                    f_bbox if f_bbox else []
+                    list(h_blk[:4]) if h_blk else [], 
+                    list(f_blk[:4]) if f_blk else []
                 ]
             
             return self.headers, self.footers, self.page_wise_coords
@@ -270,7 +339,3 @@ class PDFHeaderFooterExtractor:
         except Exception as e:
             print(f"Error extracting headers/footers: {e}")
             return [], [], {}
-
-    def _fill_empty_candidates(self, candidates_dict):
-        for k in candidates_dict:
-            candidates_dict[k].append('')
@@ -1,14 +1,18 @@
 # ... inside the loop ...
 
-                # Sort by y0 (Top)
-                by_top = sorted(valid_blocks, key=lambda b: b[1])
+                # Top 2 by y0 in one pass (as in select_page_blocks); strict comparisons
+                # keep page order on ties, exactly like the stable sort did
+                top_blk = top_plus_1_blk = None
+                for b in valid_blocks:
+                    if top_blk is None or b[1] < top_blk[1]:
+                        top_plus_1_blk = top_blk
+                        top_blk = b
+                    elif top_plus_1_blk is None or b[1] < top_plus_1_blk[1]:
+                        top_plus_1_blk = b
 
                 # Check Table Overlap logic
                 table_range = self.tables_y_coords.get(page_idx)
 
-                top_blk = by_top[0]
-                top_plus_1_blk = by_top[1] if len(by_top) > 1 else None
-
                 # --- FIX STARTS HERE ---
                 if table_range:
                     table_start_y = table_range[0]
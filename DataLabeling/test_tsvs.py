@@ -1,12 +1,65 @@
 import pandas as pd
 import glob
 import logging
-from typing import List, Dict, Any, Callable
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Callable, Optional
 from pathlib import Path
 
+# Optional multithreaded Arrow CSV parser; falls back to pandas' C engine without pyarrow
+try:
+    import pyarrow  # noqa: F401
+    READ_ENGINE = "pyarrow"
+except ImportError:
+    READ_ENGINE = "c"
+
+# Column kinds the Arrow reader infers from ISO-8601 text where the C engine keeps strings
+TEMPORAL_KINDS = {"date", "time", "datetime", "datetime64"}
+
 # Setup logging for production-grade tracking
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
+def read_tsv(file_path: str) -> pd.DataFrame:
+    """
+    Reads one TSV with READ_ENGINE, pinned to the C engine's column dtypes so rules see the
+    same frame whether or not pyarrow is installed. Arrow parses ISO dates/times/timestamps
+    into temporal columns; a file where it did is re-read with the C engine.
+    Float values may still differ in the last digit: Arrow rounds correctly, the C engine's
+    default parser can be one ulp off.
+    """
+    df = pd.read_csv(file_path, sep='\t', engine=READ_ENGINE)
+    if READ_ENGINE != "c" and any(
+        pd.api.types.is_datetime64_any_dtype(dtype)
+        or (dtype == object and pd.api.types.infer_dtype(df.iloc[:, i], skipna=True) in TEMPORAL_KINDS)
+        for i, dtype in enumerate(df.dtypes)
+    ):
+        df = pd.read_csv(file_path, sep='\t', engine="c")
+    return df
+
+def analyze_file(file_path: str, rules: List[Callable[[pd.DataFrame], Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Reads one TSV and applies every rule to it. Returns None (after logging) if the file fails.
+    Module-level so it can run in worker processes; rules must be module-level functions.
+    """
+    try:
+        # Reading with 'sep=\t' as per your TSV requirement
+        df = read_tsv(file_path)
+        
+        # Start file summary with the filename
+        file_summary = {"filename": Path(file_path).name}
+        
+        # Apply each modular rule
+        for rule in rules:
+            file_summary.update(rule(df))
+        
+        logging.info(f"Successfully analyzed: {file_path}")
+        return file_summary
+        
+    except Exception as e:
+        logging.error(f"Error processing {file_path}: {e}")
+        return None
+
 class TSVAnalyzer:
     """
     Analyzes a collection of TSV files based on pluggable validation rules.
@@ -18,27 +71,21 @@ class TSVAnalyzer:
         if not self.file_paths:
             logging.warning(f"No files matching '{file_pattern}' were found.")
 
-    def run_analysis(self, rules: List[Callable[[pd.DataFrame], Dict[str, Any]]]):
+    def run_analysis(self, rules: List[Callable[[pd.DataFrame], Dict[str, Any]]], max_workers: Optional[int] = 1):
         """
         Iterates through files and applies a list of analysis functions.
+        max_workers: 1 = in-process, None = all cores, N = N worker processes (one file per task).
         """
-        for file_path in self.file_paths:
-            try:
-                # Reading with 'sep=\t' as per your TSV requirement
-                df = pd.read_csv(file_path, sep='\t')
-                
-                # Start file summary with the filename
-                file_summary = {"filename": Path(file_path).name}
-                
-                # Apply each modular rule
-                for rule in rules:
-                    file_summary.update(rule(df))
-                
-                self.results.append(file_summary)
-                logging.info(f"Successfully analyzed: {file_path}")
-                
-            except Exception as e:
-                logging.error(f"Error processing {file_path}: {e}")
+        analyze = partial(analyze_file, rules=rules)
+        if max_workers == 1 or len(self.file_paths) < 2:
+            summaries = map(analyze, self.file_paths)
+        else:
+            # Processes, not threads: parsing and the rules hold the GIL.
+            # map() keeps the report in file order.
+            with ProcessPoolExecutor(max_workers=max_workers) as ex:
+                summaries = list(ex.map(analyze, self.file_paths))
+
+        self.results.extend(summary for summary in summaries if summary is not None)
 
     def get_report(self) -> pd.DataFrame:
         """Returns the final results as a structured DataFrame."""
@@ -73,8 +120,8 @@ if __name__ == "__main__":
     # Define which rules to apply (Add more functions to this list as needed)
     active_rules = [analyze_category_field, check_empty_file]
     
-    # Run and display
-    analyzer.run_analysis(rules=active_rules)
+    # Run and display (files are parsed in parallel, up to 4 at a time)
+    analyzer.run_analysis(rules=active_rules, max_workers=min(os.cpu_count() or 1, 4))
     report = analyzer.get_report()
     
     if not report.empty: